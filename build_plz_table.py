@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Builds plz_de.bin (PLZ -> latitude, longitude) for main.py.
+
+Input: GeoNames postal code dump for Germany (tab-separated DE.txt, or DE.zip as downloaded from
+https://download.geonames.org/export/zip/DE.zip, CC BY 4.0).
+PLZ with several places are averaged to a single point.
+
+Output layout (little-endian, structure of arrays, read via mmap by main.PlzTable):
+    b"PLZ1" | u32 n | u32 plz[n] (sorted) | i32 lat_e6[n] | i32 lon_e6[n]
+
+Usage:
+    python build_plz_table.py DE.zip|DE.txt [plz_de.bin]
+"""
+
+import csv
+import io
+import struct
+import sys
+import zipfile
+from array import array
+from typing import Dict, List, Tuple
+
+
+def read_geonames(path: str) -> Dict[str, Tuple[float, float]]:
+    points: Dict[str, List[Tuple[float, float]]] = {}
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path) as zf:
+            fh = io.TextIOWrapper(zf.open("DE.txt"), encoding="utf-8", newline="")
+            rows = list(csv.reader(fh, delimiter="\t", quoting=csv.QUOTE_NONE))
+    else:
+        with open(path, encoding="utf-8", newline="") as fh:
+            rows = list(csv.reader(fh, delimiter="\t", quoting=csv.QUOTE_NONE))
+
+    for row in rows:
+        if len(row) < 11:
+            continue
+        plz = row[1].strip()
+        if len(plz) != 5 or not plz.isdigit():
+            continue
+        try:
+            lat, lon = float(row[9]), float(row[10])
+        except ValueError:
+            continue
+        points.setdefault(plz, []).append((lat, lon))
+
+    out = {}
+    for plz, pts in points.items():
+        out[plz] = (
+            round(sum(p[0] for p in pts) / len(pts), 6),
+            round(sum(p[1] for p in pts) / len(pts), 6),
+        )
+    return out
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) < 2:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    src = argv[1]
+    dst = argv[2] if len(argv) > 2 else "plz_de.bin"
+
+    table = read_geonames(src)
+    keys = sorted(table)
+    columns = [
+        array("I", (int(plz) for plz in keys)),
+        array("i", (round(table[plz][0] * 1e6) for plz in keys)),
+        array("i", (round(table[plz][1] * 1e6) for plz in keys)),
+    ]
+    with open(dst, "wb") as fh:
+        fh.write(struct.pack("<4sI", b"PLZ1", len(keys)))
+        for col in columns:
+            if sys.byteorder != "little":
+                col.byteswap()
+            fh.write(col.tobytes())
+    print(f"Wrote {len(table)} PLZ to {dst}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
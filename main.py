@@ -3,18 +3,38 @@
 """
 API:
 - GET /api?plz=<postleitzahl>&coordsys=<system> -> Gibt die Koordinaten für eine bestimmte Postleitzahl in einem bestimmten Koordinatensystem zurück
+- GET /api/batch?plz=<plz1>,<plz2>,...&coordsys=<system> -> Wie /api für bis zu 500 PLZ (davon max. 10 per Nominatim), als NDJSON
 """
 
+# Must run before anything imports socket/ssl/threading (requests, urllib3):
+# with gunicorn's gevent worker, waiting on Nominatim then yields instead of blocking the worker.
+from gevent import monkey
+
+monkey.patch_all()
+
+import gzip
+import hashlib
+import mmap
 import os
-import re
+import struct
+import sys
 import logging
+import sqlite3
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_left
 from functools import lru_cache
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from flask import Flask, jsonify, render_template_string, request
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderServiceError, GeocoderTimedOut, GeocoderUnavailable
-from pyproj import Proj, transform, exceptions
+import brotli
+import orjson
+from flask import Flask, Response, abort, request, send_from_directory
+from markupsafe import Markup
+import requests
+from pyproj import Transformer, exceptions
+from requests.adapters import HTTPAdapter
 
 # ---------------------------------------------------------
 # Coordinate Systems (edit here)
@@ -48,11 +68,10 @@ SERVICE_META = {
 # ---------------------------------------------------------
 # Flask App
 # ---------------------------------------------------------
-app = Flask(__name__)
+# static_folder=None: /static is served by static_asset() below with fingerprinted, immutable URLs.
+app = Flask(__name__, static_folder=None)
 app.logger.setLevel(logging.INFO)
 
-PLZ_RE = re.compile(r"^\d{5}$")
-
 
 def _env_float(name: str, default: float, min_v: float, max_v: float) -> float:
     raw = os.getenv(name, "").strip()
@@ -79,8 +98,145 @@ NOMINATIM_USER_AGENT = _env_str(
 )
 NOMINATIM_TIMEOUT_SECONDS = _env_float("NOMINATIM_TIMEOUT_SECONDS", 4.0, 1.0, 20.0)
 NOMINATIM_COUNTRY_CODES = _env_str("NOMINATIM_COUNTRY_CODES", "de", max_len=50)
+NOMINATIM_MIN_INTERVAL_SECONDS = _env_float("NOMINATIM_MIN_INTERVAL_SECONDS", 1.0, 0.0, 10.0)
+
+NOMINATIM_SEARCH_URL = "https://nominatim.openstreetmap.org/search"
+
+
+def _build_session() -> requests.Session:
+    """
+    One pooled session per process: keep-alive connections avoid a TCP+TLS handshake per geocode.
+    """
+    session = requests.Session()
+    session.headers.update({"User-Agent": NOMINATIM_USER_AGENT, "Connection": "keep-alive"})
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=50,
+            # No urllib3 retries: they would bypass the rate limiter. _geocode_nominatim retries itself.
+            max_retries=0,
+        ),
+    )
+    return session
+
+
+_session = _build_session()
+
+PLZ_TABLE_PATH = _env_str(
+    "PLZ_TABLE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "plz_de.bin"),
+    max_len=500,
+)
+
+# plz_de.bin layout (little-endian, see build_plz_table.py):
+#   b"PLZ1" | u32 n | u32 plz[n] (sorted) | i32 lat_e6[n] | i32 lon_e6[n]
+PLZ_TABLE_MAGIC = b"PLZ1"
+PLZ_TABLE_HEADER = struct.Struct("<4sI")
+
+
+class PlzTable:
+    """
+    Read-only PLZ -> (latitude, longitude) table over a memory-mapped plz_de.bin.
+    Structure of arrays (~12 bytes per PLZ); lookup is a binary search over the sorted PLZ array.
+    The mapping is shared between all worker processes via the page cache.
+    """
+
+    def __init__(self, keys=(), lats=(), lons=()):
+        self._keys = keys
+        self._lats = lats
+        self._lons = lons
+
+    @classmethod
+    def from_file(cls, path: str) -> "PlzTable":
+        with open(path, "rb") as fh:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n = PLZ_TABLE_HEADER.unpack_from(mm, 0)
+        if magic != PLZ_TABLE_MAGIC or len(mm) != PLZ_TABLE_HEADER.size + 12 * n:
+            raise ValueError("invalid PLZ table file")
+
+        offsets = [PLZ_TABLE_HEADER.size + 4 * n * i for i in range(4)]
+        columns = []
+        for typecode, start, end in zip("Iii", offsets, offsets[1:]):
+            if sys.byteorder == "little":
+                columns.append(memoryview(mm)[start:end].cast(typecode))
+            else:
+                col = array(typecode, mm[start:end])
+                col.byteswap()
+                columns.append(col)
+        return cls(*columns)
+
+    def _index(self, plz: str) -> int:
+        try:
+            key = int(plz)
+        except ValueError:
+            return -1
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return i
+        return -1
+
+    def get(self, plz: str) -> Optional[Tuple[float, float]]:
+        i = self._index(plz)
+        if i < 0:
+            return None
+        return (self._lats[i] / 1e6, self._lons[i] / 1e6)
+
+    def __contains__(self, plz: str) -> bool:
+        return self._index(plz) >= 0
+
+    def __getitem__(self, plz: str) -> Tuple[float, float]:
+        hit = self.get(plz)
+        if hit is None:
+            raise KeyError(plz)
+        return hit
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
 
-_geolocator = Nominatim(user_agent=NOMINATIM_USER_AGENT, timeout=NOMINATIM_TIMEOUT_SECONDS)
+# Without the table every lookup goes through the 1 req/s Nominatim limiter, so a missing or broken
+# table stops the service at startup. PLZ_TABLE_OPTIONAL=1 allows running without it (local development).
+PLZ_TABLE_OPTIONAL = _env_str("PLZ_TABLE_OPTIONAL", "0", max_len=10).lower() in ("1", "true", "yes")
+
+
+def load_plz_table(path: str) -> PlzTable:
+    """
+    Loads the bundled PLZ table (see build_plz_table.py).
+    Raises RuntimeError if it is missing, unreadable or empty, unless PLZ_TABLE_OPTIONAL is set;
+    then an empty table is returned and lookups fall back to Nominatim.
+    """
+    try:
+        table = PlzTable.from_file(path)
+        if not len(table):
+            raise ValueError("PLZ table is empty")
+    except Exception as e:
+        if not PLZ_TABLE_OPTIONAL:
+            raise RuntimeError(
+                f"PLZ table {path} could not be loaded ({e}). Build it with build_plz_table.py (see README) "
+                "or set PLZ_TABLE_OPTIONAL=1 to run on Nominatim only."
+            ) from e
+        app.logger.warning("PLZ table %s not loaded (%s), every lookup goes to Nominatim", path, e)
+        return PlzTable()
+
+    app.logger.info("Loaded %d PLZ entries from %s", len(table), path)
+    return table
+
+
+PLZ_TABLE = load_plz_table(PLZ_TABLE_PATH)
+
+# Attribution per data source (GeoNames: CC BY 4.0, OpenStreetMap/Nominatim: ODbL).
+COORD_SOURCES = {
+    "geonames": "GeoNames (CC BY 4.0)",
+    "nominatim": "Nominatim (OpenStreetMap, ODbL)",
+}
+
+
+def coords_source(plz: str) -> str:
+    """
+    Key into COORD_SOURCES for the coordinates lookup_coordinates_for_plz returns for this PLZ.
+    """
+    return "geonames" if plz in PLZ_TABLE else "nominatim"
 
 
 def normalize_plz(plz_raw: Optional[str]) -> str:
@@ -91,29 +247,251 @@ def normalize_plz(plz_raw: Optional[str]) -> str:
         raise ValueError("Bitte eine Postleitzahl (PLZ) angeben.")
     if len(plz) > 20:
         raise ValueError("Eingabe zu lang. Bitte genau 5 Ziffern eingeben.")
-    if not PLZ_RE.fullmatch(plz):
+    # isascii(): str.isdigit() alone also accepts non-ASCII digits such as '²' or '٦'.
+    if len(plz) != 5 or not plz.isascii() or not plz.isdigit():
         raise ValueError("Ungültige PLZ. Bitte genau 5 Ziffern eingeben (z. B. 64283).")
     return plz
 
 
-@lru_cache(maxsize=2048)
+_inflight_guard = threading.Lock()
+# PLZ -> [lock, number of requests holding or waiting for it]
+_inflight_locks: Dict[str, list] = {}
+
+
 def lookup_coordinates_for_plz(plz: str) -> Optional[Tuple[float, float]]:
     """
     Returns (latitude, longitude) or None if not found.
+    Served from PLZ_TABLE; only unknown PLZ are geocoded via Nominatim.
     Raises RuntimeError on service issues.
     """
+    hit = PLZ_TABLE.get(plz)
+    if hit is not None:
+        return hit
+    cached = _memory_cache_get(plz)
+    if cached is not _MISSING:
+        return cached
+    # Concurrent requests for the same uncached PLZ wait for one upstream call instead of each geocoding it.
+    # The entry is dropped once its last waiter is done, so misses do not leave locks behind.
+    with _inflight_guard:
+        entry = _inflight_locks.get(plz)
+        if entry is None:
+            entry = _inflight_locks[plz] = [threading.Lock(), 0]
+        entry[1] += 1
     try:
-        loc = _geolocator.geocode(query=plz, country_codes=NOMINATIM_COUNTRY_CODES)
-        if not loc:
-            return None
-        return (float(loc.latitude), float(loc.longitude))
-    except (GeocoderTimedOut, GeocoderUnavailable):
-        raise RuntimeError("Der Geocoding-Dienst hat nicht rechtzeitig geantwortet. Bitte später erneut versuchen.")
-    except GeocoderServiceError:
-        raise RuntimeError("Der Geocoding-Dienst ist aktuell nicht verfügbar. Bitte später erneut versuchen.")
-    except Exception:
-        app.logger.exception("Unexpected error during geocoding")
-        raise RuntimeError("Unerwarteter Fehler beim Geocoding. Bitte später erneut versuchen.")
+        with entry[0]:
+            return _geocode_plz(plz)
+    finally:
+        with _inflight_guard:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _inflight_locks[plz]
+
+
+PLZ_CACHE_PATH = _env_str(
+    "PLZ_CACHE_PATH",
+    os.path.join(tempfile.gettempdir(), "plz-cache.sqlite"),
+    max_len=500,
+)
+PLZ_NEGATIVE_CACHE_SECONDS = _env_float("PLZ_NEGATIVE_CACHE_SECONDS", 86400.0, 0.0, 30 * 86400.0)
+
+_MISSING = object()
+
+# In-process cache for geocoded PLZ. Plain dicts: reads are lock-free, and the keyspace is bounded by
+# normalize_plz (5 digits), so they need no eviction. Found coordinates are kept for the process lifetime;
+# not-found results only until their expiry (monotonic time), like the NULL rows in the SQLite cache.
+_COORD_CACHE: Dict[str, Tuple[float, float]] = {}
+_NOT_FOUND_UNTIL: Dict[str, float] = {}
+
+
+def _memory_cache_get(plz: str):
+    """
+    Returns the cached (latitude, longitude), None for an unexpired not-found result, or _MISSING.
+    """
+    hit = _COORD_CACHE.get(plz)
+    if hit is not None:
+        return hit
+    if _NOT_FOUND_UNTIL.get(plz, 0.0) > time.monotonic():
+        return None
+    return _MISSING
+
+
+def _memory_cache_put(plz: str, coords: Optional[Tuple[float, float]]) -> None:
+    if coords is None:
+        _NOT_FOUND_UNTIL[plz] = time.monotonic() + PLZ_NEGATIVE_CACHE_SECONDS
+    else:
+        _COORD_CACHE[plz] = coords
+        _NOT_FOUND_UNTIL.pop(plz, None)
+
+
+def open_geocode_cache(path: str) -> Optional[sqlite3.Connection]:
+    """
+    Opens the on-disk geocode cache shared by all workers on this host (WAL mode).
+    Returns None if it cannot be opened; lookups then only use the in-process cache.
+    """
+    try:
+        conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS plz (plz TEXT PRIMARY KEY, lat REAL, lon REAL, ts INTEGER)")
+        return conn
+    except sqlite3.Error:
+        app.logger.exception("Could not open geocode cache %s", path)
+        return None
+
+
+_cache_db = open_geocode_cache(PLZ_CACHE_PATH)
+_cache_db_lock = threading.Lock()
+
+
+def _cache_get(plz: str):
+    """
+    Returns the cached (latitude, longitude), None for a cached negative result, or _MISSING.
+    """
+    if _cache_db is None:
+        return _MISSING
+    try:
+        with _cache_db_lock:
+            # Not-found rows expire so a bad or empty Nominatim answer is retried eventually.
+            row = _cache_db.execute(
+                "SELECT lat, lon FROM plz WHERE plz = ? AND (lat IS NOT NULL OR ts > ?)",
+                (plz, int(time.time() - PLZ_NEGATIVE_CACHE_SECONDS)),
+            ).fetchone()
+    except sqlite3.Error:
+        app.logger.exception("Geocode cache read failed")
+        return _MISSING
+    if row is None:
+        return _MISSING
+    if row[0] is None or row[1] is None:
+        return None
+    return (row[0], row[1])
+
+
+def _cache_put(plz: str, coords: Optional[Tuple[float, float]]) -> None:
+    if _cache_db is None:
+        return
+    lat, lon = coords if coords is not None else (None, None)
+    try:
+        with _cache_db_lock:
+            _cache_db.execute(
+                "INSERT OR REPLACE INTO plz (plz, lat, lon, ts) VALUES (?, ?, ?, ?)",
+                (plz, lat, lon, int(time.time())),
+            )
+    except sqlite3.Error:
+        app.logger.exception("Geocode cache write failed")
+
+
+def _geocode_plz(plz: str) -> Optional[Tuple[float, float]]:
+    """
+    In-process cache in front of the on-disk cache in front of Nominatim.
+    """
+    # Re-check: another request may have filled the cache while this one waited for the PLZ lock.
+    cached = _memory_cache_get(plz)
+    if cached is not _MISSING:
+        return cached
+    cached = _cache_get(plz)
+    if cached is None:
+        # Not-found row from the SQLite cache: its expiry is tracked there, so don't restart it here.
+        return None
+    if cached is _MISSING:
+        cached = _geocode_nominatim(plz)
+        _cache_put(plz, cached)
+    _memory_cache_put(plz, cached)
+    return cached
+
+
+NOMINATIM_MAX_ATTEMPTS = 3
+NOMINATIM_RETRY_STATUSES = {429, 502, 503, 504}
+# A request that would have to wait longer than this for its turn fails instead of hanging.
+NOMINATIM_MAX_WAIT_SECONDS = 10.0
+
+_rate_lock = threading.Lock()
+_next_request_at = 0.0
+
+
+def _wait_for_rate_limit() -> None:
+    """
+    Spaces Nominatim requests of this process at least NOMINATIM_MIN_INTERVAL_SECONDS apart
+    (usage policy: max. 1 request/s). Called before every upstream attempt, only on cache misses.
+    Each caller reserves the next free slot under the lock and sleeps outside it, so the wait covers
+    everyone queued ahead. Raises RuntimeError if that slot is more than NOMINATIM_MAX_WAIT_SECONDS away.
+    """
+    global _next_request_at
+    with _rate_lock:
+        now = time.monotonic()
+        slot = max(_next_request_at, now)
+        if slot - now > NOMINATIM_MAX_WAIT_SECONDS:
+            raise RuntimeError("Der Geocoding-Dienst ist aktuell ausgelastet. Bitte später erneut versuchen.")
+        _next_request_at = slot + NOMINATIM_MIN_INTERVAL_SECONDS
+    wait = slot - time.monotonic()
+    if wait > 0:
+        time.sleep(wait)
+
+
+def _defer_rate_limit(seconds: float) -> None:
+    """
+    Pushes the next allowed request out by `seconds` (Retry-After / 429 backoff) for all callers.
+    """
+    global _next_request_at
+    with _rate_lock:
+        _next_request_at = max(_next_request_at, time.monotonic() + seconds)
+
+
+def _retry_delay(resp: requests.Response, attempt: int) -> float:
+    """
+    Retry-After (delta-seconds) if given, else exponential backoff from the limiter interval.
+    """
+    try:
+        delay = float(resp.headers.get("Retry-After", ""))
+    except ValueError:
+        delay = max(NOMINATIM_MIN_INTERVAL_SECONDS, 1.0) * 2 ** attempt
+    return min(max(delay, 0.0), 300.0)
+
+
+def _geocode_nominatim(plz: str) -> Optional[Tuple[float, float]]:
+    for attempt in range(NOMINATIM_MAX_ATTEMPTS):
+        _wait_for_rate_limit()
+        last_attempt = attempt == NOMINATIM_MAX_ATTEMPTS - 1
+        try:
+            resp = _session.get(
+                NOMINATIM_SEARCH_URL,
+                params={
+                    "postalcode": plz,
+                    "countrycodes": NOMINATIM_COUNTRY_CODES,
+                    "format": "jsonv2",
+                    "limit": 1,
+                },
+                timeout=NOMINATIM_TIMEOUT_SECONDS,
+            )
+            if resp.status_code in NOMINATIM_RETRY_STATUSES:
+                # Back off for every caller, also after the last attempt.
+                _defer_rate_limit(_retry_delay(resp, attempt))
+                if not last_attempt:
+                    continue
+            resp.raise_for_status()
+            hits = orjson.loads(resp.content)
+            if not hits:
+                return None
+            return (float(hits[0]["lat"]), float(hits[0]["lon"]))
+        except requests.ConnectionError:
+            if last_attempt:
+                raise RuntimeError(
+                    "Der Geocoding-Dienst hat nicht rechtzeitig geantwortet. Bitte später erneut versuchen."
+                )
+        except requests.Timeout:
+            raise RuntimeError("Der Geocoding-Dienst hat nicht rechtzeitig geantwortet. Bitte später erneut versuchen.")
+        except requests.RequestException:
+            raise RuntimeError("Der Geocoding-Dienst ist aktuell nicht verfügbar. Bitte später erneut versuchen.")
+        except Exception:
+            app.logger.exception("Unexpected error during geocoding")
+            raise RuntimeError("Unerwarteter Fehler beim Geocoding. Bitte später erneut versuchen.")
+    raise RuntimeError("Der Geocoding-Dienst ist aktuell nicht verfügbar. Bitte später erneut versuchen.")
+
+
+# Built once at import: Transformer setup (CRS parsing, PROJ context) is far more expensive than a transform.
+TRANSFORMERS: Dict[str, Transformer] = {
+    epsg: Transformer.from_crs("EPSG:4326", epsg, always_xy=True)
+    for epsg in {v["epsg"] for v in COORDINATE_SYSTEMS.values()} - {"EPSG:4326"}
+}
 
 
 def transform_coordinates(
@@ -124,14 +502,26 @@ def transform_coordinates(
     Raises ValueError on issues.
     """
     try:
-        in_proj = Proj("EPSG:4326")  # WGS84
-        out_proj = Proj(target_epsg)
-        x, y = transform(in_proj, out_proj, longitude, latitude, always_xy=True)
+        x, y = TRANSFORMERS[target_epsg].transform(longitude, latitude)
         return x, y
     except exceptions.ProjError as e:
         raise ValueError(f"Fehler bei der Koordinatentransformation: {e}")
 
 
+def transform_coordinates_many(
+    latitudes: List[float], longitudes: List[float], target_epsg: str
+) -> Tuple[List[float], List[float]]:
+    """
+    Like transform_coordinates, for many points in one PROJ call (used by /api/batch).
+    Raises ValueError on issues.
+    """
+    try:
+        xs, ys = TRANSFORMERS[target_epsg].transform(longitudes, latitudes)
+        return list(xs), list(ys)
+    except exceptions.ProjError as e:
+        raise ValueError(f"Fehler bei der Koordinatentransformation: {e}")
+
+
 def build_nav_items(current_base_url: str):
     """
     Ensures we do not output placeholder links. Keeps first 6 service links if list grows.
@@ -173,228 +563,7 @@ HTML_TEMPLATE = r"""<!doctype html>
   })();
   </script>
 
-  <style>
-  :root{
-    --bg: #0b0f19;
-    --bg2:#0f172a;
-    --card:#111a2e;
-    --text:#e6eaf2;
-    --muted:#a8b3cf;
-    --border: rgba(255,255,255,.10);
-    --shadow: 0 18px 60px rgba(0,0,0,.35);
-    --primary:#6ea8fe;
-    --primary2:#8bd4ff;
-    --focus: rgba(110,168,254,.45);
-
-    --radius: 18px;
-    --container: 1100px;
-    --gap: 18px;
-
-    --font: ui-sans-serif, system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial, "Apple Color Emoji","Segoe UI Emoji";
-  }
-
-  [data-theme="light"]{
-    --bg:#f6f7fb;
-    --bg2:#ffffff;
-    --card:#ffffff;
-    --text:#111827;
-    --muted:#4b5563;
-    --border: rgba(17,24,39,.12);
-    --shadow: 0 18px 60px rgba(17,24,39,.10);
-    --primary:#2563eb;
-    --primary2:#0ea5e9;
-    --focus: rgba(37,99,235,.25);
-  }
-
-  *{box-sizing:border-box}
-  html,body{height:100%}
-  body{
-    margin:0;
-    font-family:var(--font);
-    background: radial-gradient(1200px 800px at 20% -10%, rgba(110,168,254,.25), transparent 55%),
-                radial-gradient(1000px 700px at 110% 10%, rgba(139,212,255,.20), transparent 55%),
-                linear-gradient(180deg, var(--bg), var(--bg2));
-    color:var(--text);
-  }
-
-  .container{
-    max-width:var(--container);
-    margin:0 auto;
-    padding:0 18px;
-  }
-
-  .skip-link{
-    position:absolute; left:-999px; top:10px;
-    background:var(--card); color:var(--text);
-    padding:10px 12px; border-radius:10px;
-    border:1px solid var(--border);
-  }
-  .skip-link:focus{left:10px; outline:2px solid var(--focus)}
-
-  .site-header{
-    position:sticky; top:0; z-index:20;
-    backdrop-filter: blur(10px);
-    background: rgba(10, 14, 24, .55);
-    border-bottom:1px solid var(--border);
-  }
-  [data-theme="light"] .site-header{ background: rgba(246,247,251,.75); }
-
-  .header-inner{
-    display:flex; align-items:center; justify-content:space-between;
-    padding:14px 0;
-    gap:14px;
-  }
-  .brand{display:flex; align-items:center; gap:10px; text-decoration:none; color:var(--text); font-weight:700}
-  .brand-mark{
-    width:14px; height:14px; border-radius:6px;
-    background: linear-gradient(135deg, var(--primary), var(--primary2));
-    box-shadow: 0 10px 25px rgba(110,168,254,.25);
-  }
-  .nav{display:flex; gap:16px; flex-wrap:wrap}
-  .nav a{color:var(--muted); text-decoration:none; font-weight:600}
-  .nav a:hover{color:var(--text)}
-  .nav a[aria-current="page"]{color:var(--text)}
-
-  .header-actions{display:flex; gap:10px; align-items:center}
-  .header-note{
-    display:flex;
-    align-items:center;
-    gap:8px;
-    padding:8px 10px;
-    border-radius:12px;
-    border:1px solid var(--border);
-    background: rgba(255,255,255,.04);
-    color: var(--muted);
-    font-weight: 750;
-    font-size: 12px;
-    line-height: 1;
-    white-space: nowrap;
-  }
-
-  [data-theme="light"] .header-note{
-    background: rgba(17,24,39,.03);
-  }
-
-  .header-note__label{
-    letter-spacing: .06em;
-    text-transform: uppercase;
-    font-weight: 900;
-    color: var(--muted);
-  }
-
-  .header-note__mail{
-    color: var(--text);
-    text-decoration: none;
-    font-weight: 850;
-  }
-
-  .header-note__mail:hover{
-    text-decoration: underline;
-  }
-
-  /* Mobile: Label ausblenden, nur Mail zeigen */
-  @media (max-width: 720px){
-    .header-note__label{ display:none; }
-  }
-  .btn{
-    display:inline-flex; align-items:center; justify-content:center;
-    gap:8px;
-    padding:10px 14px;
-    border-radius:12px;
-    border:1px solid var(--border);
-    text-decoration:none;
-    font-weight:700;
-    color:var(--text);
-    background: transparent;
-    cursor:pointer;
-  }
-  .btn:focus{outline:2px solid var(--focus); outline-offset:2px}
-  .btn-primary{
-    border-color: transparent;
-    background: linear-gradient(135deg, var(--primary), var(--primary2));
-    color: #0b0f19;
-  }
-  [data-theme="light"] .btn-primary{ color:#ffffff; }
-  .btn-ghost{ background: transparent; }
-  .btn:hover{transform: translateY(-1px)}
-  .btn:active{transform:none}
-
-  .sr-only{
-    position:absolute; width:1px; height:1px; padding:0; margin:-1px;
-    overflow:hidden; clip:rect(0,0,0,0); border:0;
-  }
-
-  .hero{padding:42px 0 18px}
-  .kicker{
-    margin:0 0 10px;
-    display:inline-block;
-    font-weight:800;
-    letter-spacing:.08em;
-    text-transform:uppercase;
-    color:var(--muted);
-    font-size:12px;
-  }
-  h1{margin:0 0 12px; font-size:42px; line-height:1.1}
-  @media (max-width: 520px){ h1{font-size:34px} }
-  .lead{margin:0 0 18px; color:var(--muted); font-size:16px; line-height:1.6}
-
-  .toolbar{
-    display:flex; gap:12px; flex-wrap:wrap;
-    align-items:center;
-    margin:18px 0 18px;
-  }
-  .search{flex:1; min-width:220px}
-  .search input{
-    width:100%;
-    padding:12px 14px;
-    border-radius:12px;
-    border:1px solid var(--border);
-    background: rgba(255,255,255,.04);
-    color: var(--text);
-    font-weight:650;
-  }
-  [data-theme="light"] .search input{ background: rgba(17,24,39,.03); }
-  .search input:focus{ outline:2px solid var(--focus); outline-offset:2px }
-
-  .card{
-    border:1px solid var(--border);
-    border-radius: var(--radius);
-    background: rgba(255,255,255,.04);
-    padding:16px;
-    box-shadow: var(--shadow);
-    transition: transform .12s ease, border-color .12s ease;
-  }
-  [data-theme="light"] .card{ background: rgba(255,255,255,.92); }
-  .card:hover{ transform: translateY(-2px); border-color: rgba(110,168,254,.35); }
-
-  .card-title{font-weight:900; font-size:16px; margin:0 0 8px}
-  .card-desc{color:var(--muted); margin:0 0 12px; line-height:1.55}
-
-  /* Minimal additions (no visual redesign) */
-  .content{padding-bottom:42px}
-  .result-grid{display:grid; grid-template-columns: 1fr; gap: var(--gap); }
-  .kv{display:flex; gap:10px; flex-wrap:wrap; align-items:baseline}
-  .kv strong{font-weight:900}
-  .mono{font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono","Courier New", monospace;}
-  .hint{font-size:12px; color:var(--muted); margin-top:10px}
-  .card.error{border-color: rgba(255,255,255,.18)}
-
-  .site-footer-notice {
-    margin-top: 28px;
-    padding-top: 18px;
-    border-top: 1px solid var(--border);
-    font-size: 12px;
-    color: var(--muted);
-    text-align: center;
-  }
-  .site-footer-notice a {
-    color: var(--muted);
-    font-weight: 600;
-  }
-  .site-footer-notice a:hover {
-    color: var(--text);
-  }
-  </style>
+  <link rel="stylesheet" href="{{ css_url }}" />
 </head>
 
 <body>
@@ -471,9 +640,7 @@ HTML_TEMPLATE = r"""<!doctype html>
              <div class="search">
                  <label class="sr-only" for="coordsys">Koordinatensystem</label>
                  <select id="coordsys" name="coordsys" class="search input">
-                     {% for key, value in coordinate_systems.items() %}
-                         <option value="{{ key }}" {% if key == selected_coordsys %}selected{% endif %}>{{ value.name }}</option>
-                     {% endfor %}
+                     {{ options_html }}
                  </select>
              </div>
             <button class="btn btn-primary" type="submit">Koordinaten holen</button>
@@ -489,7 +656,7 @@ HTML_TEMPLATE = r"""<!doctype html>
           {% elif result %}
             <div class="card">
                <div class="card-title">Ergebnis</div>
-               <p class="card-desc">Quelle: Nominatim (OpenStreetMap) • System: {{ result.coordsys_name }}</p>
+               <p class="card-desc">Quelle: {{ result.source_name }} • System: {{ result.coordsys_name }}</p>
                <div class="kv"><strong>PLZ:</strong> <span class="mono">{{ result.plz }}</span></div>
                {% if result.x and result.y %}
                    <div class="kv"><strong>X:</strong> <span class="mono">{{ "%.3f"|format(result.x) }}</span></div>
@@ -512,169 +679,261 @@ HTML_TEMPLATE = r"""<!doctype html>
           <p>
             Dieser Dienst nutzt Daten von <a href="https://www.openstreetmap.org/copyright" target="_blank" rel="noopener">OpenStreetMap</a>, die unter der <a href="https://opendatacommons.org/licenses/odbl/" target="_blank" rel="noopener">Open Data Commons Open Database Lizenz</a> (ODbL) verfügbar sind.
             Die Geokodierung erfolgt über <a href="https://nominatim.org/" target="_blank" rel="noopener">Nominatim</a>. Bitte beachten Sie die <a href="https://operations.osmfoundation.org/policies/nominatim/" target="_blank" rel="noopener">Nutzungsrichtlinie</a>.
+            Koordinaten aus der vorberechneten PLZ-Tabelle stammen von <a href="https://www.geonames.org/" target="_blank" rel="noopener">GeoNames</a> (<a href="https://creativecommons.org/licenses/by/4.0/" target="_blank" rel="noopener">CC BY 4.0</a>).
           </p>
         </footer>
       </div>
     </section>
   </main>
 
-  <script>
-    (function(){
-    const dd = document.querySelector('[data-dropdown]');
-    if(!dd) return;
-
-    const btn = dd.querySelector('.nav-dropbtn');
-    const menu = dd.querySelector('.nav-menu');
-
-    function setOpen(isOpen){
-      btn.setAttribute('aria-expanded', String(isOpen));
-      if(isOpen){
-        menu.hidden = false;
-        dd.classList.add('open');
-      }else{
-        menu.hidden = true;
-        dd.classList.remove('open');
-      }
-    }
-
-    btn.addEventListener('click', (e) => {
-      e.preventDefault();
-      e.stopPropagation();
-      const isOpen = btn.getAttribute('aria-expanded') === 'true';
-      setOpen(!isOpen);
-    });
-
-    document.addEventListener('click', (e) => {
-      if(!dd.contains(e.target)) setOpen(false);
-    });
-
-    document.addEventListener('keydown', (e) => {
-      if(e.key === 'Escape') setOpen(false);
-    });
-
-    // Wenn per Tab aus dem Dropdown rausnavigiert wird: schließen
-    dd.addEventListener('focusout', () => {
-      requestAnimationFrame(() => {
-        if(!dd.contains(document.activeElement)) setOpen(false);
-      });
-    });
-
-    // Initial geschlossen
-    setOpen(false);
-  })();
-  (function(){
-    var btn = document.getElementById('themeToggle');
-    var icon = document.getElementById('themeIcon');
-
-    function applyIcon(){
-      var isLight = document.documentElement.getAttribute('data-theme') === 'light';
-      icon.textContent = isLight ? '☀' : '☾';
-    }
-    applyIcon();
-
-    btn.addEventListener('click', function(){
-      var isLight = document.documentElement.getAttribute('data-theme') === 'light';
-      try{
-        if(isLight){
-          document.documentElement.removeAttribute('data-theme');
-          localStorage.setItem('theme','dark');
-        }else{
-          document.documentElement.setAttribute('data-theme','light');
-          localStorage.setItem('theme','light');
-        }
-      }catch(e){}
-      applyIcon();
-    });
-  })();
-  </script>
+  <script src="{{ js_url }}"></script>
 </body>
 </html>
 """
 
 
-@app.get("/")
-def index():
-    plz_raw = request.args.get("plz", "")
-    plz = plz_raw.strip() if plz_raw else ""
-    selected_coordsys = request.args.get("coordsys", "latlon")
-    if selected_coordsys not in COORDINATE_SYSTEMS:
-        selected_coordsys = "latlon"
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_ASSETS = ("app.css", "app.js")
 
-    error = None
-    result = None
 
-    if plz:
-        try:
-            plz_norm = normalize_plz(plz)
-            coords = lookup_coordinates_for_plz(plz_norm)
-            if coords is None:
-                error = f"Keine Koordinaten für PLZ {plz_norm} gefunden."
-            else:
-                lat, lon = coords
-                result = {
-                    "plz": plz_norm,
-                    "latitude": lat,
-                    "longitude": lon,
-                    "coordsys_name": COORDINATE_SYSTEMS[selected_coordsys]["name"],
-                    "x": None,
-                    "y": None,
-                }
-                if selected_coordsys != "latlon":
-                    epsg = COORDINATE_SYSTEMS[selected_coordsys]["epsg"]
-                    x, y = transform_coordinates(lat, lon, epsg)
-                    result["x"] = x
-                    result["y"] = y
+def _fingerprint(filename: str) -> str:
+    """
+    app.css -> app.<content hash>.css
+    """
+    with open(os.path.join(STATIC_DIR, filename), "rb") as fh:
+        digest = hashlib.blake2b(fh.read(), digest_size=6).hexdigest()
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.{digest}{ext}"
 
-        except ValueError as ve:
-            error = str(ve)
-        except RuntimeError as rexc:
-            error = str(rexc)
 
-    current_base = request.url_root
-    nav_items = build_nav_items(current_base_url=current_base)
+# Current fingerprinted name -> file in STATIC_DIR. A changed file gets a new URL, so assets can be cached forever.
+_FINGERPRINTED: Dict[str, str] = {_fingerprint(name): name for name in STATIC_ASSETS}
+ASSET_URLS: Dict[str, str] = {name: f"/static/{fp}" for fp, name in _FINGERPRINTED.items()}
+
+
+def _asset_for(filename: str) -> Optional[str]:
+    """
+    app.<any hex>.css -> app.css. Pages cached before a deploy still reference an older hash;
+    they get the current file instead of a 404.
+    """
+    parts = filename.split(".")
+    if len(parts) != 3:
+        return None
+    stem, digest, ext = parts
+    real = f"{stem}.{ext}"
+    if real not in STATIC_ASSETS or not digest or any(c not in "0123456789abcdef" for c in digest):
+        return None
+    return real
+
+
+@app.get("/static/<filename>")
+def static_asset(filename: str):
+    real = _asset_for(filename)
+    if real is None:
+        abort(404)
+    resp = send_from_directory(STATIC_DIR, real)
+    if filename in _FINGERPRINTED:
+        resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    else:
+        # Outdated hash: the content behind this URL is not what it was named after, so do not pin it.
+        resp.headers["Cache-Control"] = "public, max-age=300"
+    return resp
+
+
+# The coordinate system <select> only differs in which option is selected: prebuild one fragment per choice.
+_OPTIONS_BY_SEL: Dict[str, Markup] = {
+    sel: Markup("").join(
+        Markup('<option value="{}"{}>{}</option>').format(
+            key, Markup(" selected") if key == sel else "", value["name"]
+        )
+        for key, value in COORDINATE_SYSTEMS.items()
+    )
+    for sel in COORDINATE_SYSTEMS
+}
+
+# Compiled once; render_template_string would re-parse the template on every request.
+_TEMPLATE = app.jinja_env.from_string(HTML_TEMPLATE)
+# Part of every page ETag, so a deploy with a changed template or assets invalidates cached pages.
+_TEMPLATE_HASH = hashlib.blake2b(
+    "|".join([HTML_TEMPLATE, *sorted(_FINGERPRINTED)]).encode("utf-8"), digest_size=8
+).hexdigest()
 
-    return render_template_string(
-        HTML_TEMPLATE,
+
+def render_page(plz: str, error: Optional[str], result: Optional[dict], selected_coordsys: str, nav_items) -> str:
+    return _TEMPLATE.render(
         meta=SERVICE_META,
         landing_url=LANDING_URL,
         cookbook_url=COOKBOOK_URL,
+        css_url=ASSET_URLS["app.css"],
+        js_url=ASSET_URLS["app.js"],
         nav_items=nav_items,
         plz=plz,
         error=error,
         result=result,
-        coordinate_systems=COORDINATE_SYSTEMS,
+        options_html=_OPTIONS_BY_SEL[selected_coordsys],
         selected_coordsys=selected_coordsys,
     )
 
 
-@app.get("/api")
-def api():
-    try:
-        plz = normalize_plz(request.args.get("plz", None))
-        selected_coordsys = request.args.get("coordsys", "latlon")
-        if selected_coordsys not in COORDINATE_SYSTEMS:
-            selected_coordsys = "latlon"
-    except ValueError as ve:
-        return jsonify(ok=False, error=str(ve)), 400
+def _precompress(body: bytes) -> Dict[str, bytes]:
+    return {
+        "br": brotli.compress(body, quality=11),
+        "gzip": gzip.compress(body, 9),
+        "identity": body,
+    }
 
-    try:
-        coords = lookup_coordinates_for_plz(plz)
-    except RuntimeError as rexc:
-        return jsonify(ok=False, error=str(rexc)), 503
 
-    if coords is None:
-        return jsonify(ok=False, error=f"Keine Koordinaten für PLZ {plz} gefunden."), 404
+# The page without a PLZ only depends on the selected coordinate system:
+# render and compress each variant once, then serve the stored bytes.
+_LANDING_HTML: Dict[str, Dict[str, bytes]] = {
+    key: _precompress(
+        render_page(
+            plz="",
+            error=None,
+            result=None,
+            selected_coordsys=key,
+            nav_items=build_nav_items(current_base_url=""),
+        ).encode("utf-8")
+    )
+    for key in COORDINATE_SYSTEMS
+}
 
-    lat, lon = coords
-    response_data = {
+
+def precompressed_response(variants: Dict[str, bytes], cache_control: str) -> Response:
+    encoding = "identity"
+    if request.accept_encodings["br"]:
+        encoding = "br"
+    elif request.accept_encodings["gzip"]:
+        encoding = "gzip"
+
+    resp = Response(variants[encoding], mimetype="text/html")
+    if encoding != "identity":
+        resp.headers["Content-Encoding"] = encoding
+    resp.headers["Vary"] = "Accept-Encoding"
+    resp.headers["Cache-Control"] = cache_control
+    return resp
+
+
+@lru_cache(maxsize=512)
+def _render_result_page(
+    plz: str, selected_coordsys: str, error: Optional[str], coords: Optional[Tuple[float, float]]
+) -> bytes:
+    """
+    Rendered result page for a normalized lookup outcome. Deterministic in its arguments,
+    so repeat requests skip the transform and Jinja entirely. Bounded because `plz` is raw user input.
+    """
+    result = None
+    if error is None and coords is not None:
+        lat, lon = coords
+        result = {
+            "plz": plz,
+            "latitude": lat,
+            "longitude": lon,
+            "coordsys_name": COORDINATE_SYSTEMS[selected_coordsys]["name"],
+            "source_name": COORD_SOURCES[coords_source(plz)],
+            "x": None,
+            "y": None,
+        }
+        if selected_coordsys != "latlon":
+            try:
+                epsg = COORDINATE_SYSTEMS[selected_coordsys]["epsg"]
+                x, y = transform_coordinates(lat, lon, epsg)
+                result["x"] = x
+                result["y"] = y
+            except ValueError as ve:
+                error = str(ve)
+                result = None
+
+    return render_page(
+        plz=plz,
+        error=error,
+        result=result,
+        selected_coordsys=selected_coordsys,
+        nav_items=build_nav_items(current_base_url=""),
+    ).encode("utf-8")
+
+
+@app.get("/")
+def index():
+    plz_raw = request.args.get("plz", "")
+    plz = plz_raw.strip() if plz_raw else ""
+    selected_coordsys = request.args.get("coordsys", "latlon")
+    if selected_coordsys not in COORDINATE_SYSTEMS:
+        selected_coordsys = "latlon"
+
+    if not plz:
+        return precompressed_response(_LANDING_HTML[selected_coordsys], "public, max-age=86400")
+
+    error = None
+    coords = None
+    transient_error = False
+
+    try:
+        plz_norm = normalize_plz(plz)
+        coords = lookup_coordinates_for_plz(plz_norm)
+        if coords is None:
+            error = f"Keine Koordinaten für PLZ {plz_norm} gefunden."
+    except ValueError as ve:
+        error = str(ve)
+    except RuntimeError as rexc:
+        error = str(rexc)
+        transient_error = True
+
+    # The page is deterministic in its inputs: answer revalidations with 304 before rendering anything.
+    # Geocoder outages are not cached so a reload retries the lookup.
+    etag = None
+    if not transient_error:
+        etag = hashlib.blake2b(
+            f"{_TEMPLATE_HASH}|{plz}|{selected_coordsys}|{error}|{coords}".encode("utf-8"), digest_size=8
+        ).hexdigest()
+        if request.if_none_match.contains_weak(etag):
+            resp = Response(status=304)
+            resp.set_etag(etag)
+            resp.headers["Cache-Control"] = "private, max-age=3600"
+            return resp
+
+    resp = Response(_render_result_page(plz, selected_coordsys, error, coords), mimetype="text/html")
+    if etag is None:
+        resp.headers["Cache-Control"] = "no-store"
+    else:
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = "private, max-age=3600"
+    return resp
+
+
+def json_response(data: dict, status: int = 200) -> Response:
+    return Response(orjson.dumps(data), status=status, mimetype="application/json")
+
+
+def _coords_payload(plz: str, selected_coordsys: str, lat: float, lon: float) -> dict:
+    source = coords_source(plz)
+    return {
         "ok": True,
         "plz": plz,
         "latitude": lat,
         "longitude": lon,
         "coordsys": selected_coordsys,
         "coordsys_name": COORDINATE_SYSTEMS[selected_coordsys]["name"],
+        "source": source,
+        "attribution": COORD_SOURCES[source],
     }
 
+
+def api_result(plz: str, selected_coordsys: str) -> Tuple[dict, int]:
+    """
+    Builds the /api payload for an already normalized PLZ. Returns (data, http_status).
+    """
+    try:
+        coords = lookup_coordinates_for_plz(plz)
+    except RuntimeError as rexc:
+        return {"ok": False, "plz": plz, "error": str(rexc)}, 503
+
+    if coords is None:
+        return {"ok": False, "plz": plz, "error": f"Keine Koordinaten für PLZ {plz} gefunden."}, 404
+
+    lat, lon = coords
+    response_data = _coords_payload(plz, selected_coordsys, lat, lon)
+
     if selected_coordsys != "latlon":
         try:
             epsg = COORDINATE_SYSTEMS[selected_coordsys]["epsg"]
@@ -682,9 +941,107 @@ def api():
             response_data["x"] = x
             response_data["y"] = y
         except ValueError as ve:
-            return jsonify(ok=False, error=str(ve)), 400
+            return {"ok": False, "plz": plz, "error": str(ve)}, 400
+
+    return response_data, 200
+
+
+@app.get("/api")
+def api():
+    try:
+        plz = normalize_plz(request.args.get("plz", None))
+        selected_coordsys = request.args.get("coordsys", "latlon")
+        if selected_coordsys not in COORDINATE_SYSTEMS:
+            selected_coordsys = "latlon"
+    except ValueError as ve:
+        return json_response({"ok": False, "error": str(ve)}, status=400)
+
+    data, status = api_result(plz, selected_coordsys)
+    if not data["ok"]:
+        return json_response({"ok": False, "error": data["error"]}, status=status)
+    return json_response(data)
+
+
+BATCH_MAX_PLZ = 500
+# Uncached PLZ geocoded per batch: each one costs a rate-limited Nominatim call (~1 s) that other users queue behind.
+BATCH_MAX_GEOCODE = 10
+
+
+def _batch_table_hits(plzs: List[str], selected_coordsys: str):
+    """
+    NDJSON lines for PLZ known to PLZ_TABLE; all points are transformed in a single call.
+    """
+    items = [_coords_payload(plz, selected_coordsys, *PLZ_TABLE[plz]) for plz in plzs]
+    if items and selected_coordsys != "latlon":
+        epsg = COORDINATE_SYSTEMS[selected_coordsys]["epsg"]
+        try:
+            xs, ys = transform_coordinates_many(
+                [item["latitude"] for item in items], [item["longitude"] for item in items], epsg
+            )
+        except ValueError as ve:
+            items = [{"ok": False, "plz": plz, "error": str(ve)} for plz in plzs]
+        else:
+            for item, x, y in zip(items, xs, ys):
+                item["x"] = x
+                item["y"] = y
+    for item in items:
+        yield orjson.dumps(item) + b"\n"
+
 
-    return jsonify(response_data)
+@app.get("/api/batch")
+def api_batch():
+    """
+    GET /api/batch?plz=64283,10115,...&coordsys=<system>
+    Streams one JSON object per line (NDJSON) in the /api format, plus "plz" on errors.
+    PLZ from the preloaded table are emitted first; the rest follow as they are geocoded.
+    At most BATCH_MAX_GEOCODE uncached PLZ are geocoded, further ones are reported as errors.
+    """
+    raw = [p.strip() for p in request.args.get("plz", "").split(",")]
+    raw = [p for p in raw if p]
+    if not raw:
+        return json_response({"ok": False, "error": "Bitte mindestens eine Postleitzahl (PLZ) angeben."}, status=400)
+    if len(raw) > BATCH_MAX_PLZ:
+        return json_response({"ok": False, "error": f"Maximal {BATCH_MAX_PLZ} PLZ pro Anfrage."}, status=400)
+
+    selected_coordsys = request.args.get("coordsys", "latlon")
+    if selected_coordsys not in COORDINATE_SYSTEMS:
+        selected_coordsys = "latlon"
+
+    invalid = []
+    hits = []
+    misses = []
+    to_geocode = set()
+    for plz_raw in raw:
+        try:
+            plz = normalize_plz(plz_raw)
+        except ValueError as ve:
+            invalid.append({"ok": False, "plz": plz_raw[:20], "error": str(ve)})
+            continue
+        if plz in PLZ_TABLE:
+            hits.append(plz)
+        elif plz in to_geocode or _memory_cache_get(plz) is not _MISSING or len(to_geocode) < BATCH_MAX_GEOCODE:
+            if _memory_cache_get(plz) is _MISSING:
+                to_geocode.add(plz)
+            misses.append(plz)
+        else:
+            invalid.append({
+                "ok": False,
+                "plz": plz,
+                "error": (
+                    f"Maximal {BATCH_MAX_GEOCODE} nicht vorberechnete PLZ pro Anfrage. "
+                    "Bitte später erneut versuchen."
+                ),
+            })
+
+    def generate():
+        for item in invalid:
+            yield orjson.dumps(item) + b"\n"
+        yield from _batch_table_hits(hits, selected_coordsys)
+        for plz in misses:
+            data, _ = api_result(plz, selected_coordsys)
+            yield orjson.dumps(data) + b"\n"
+
+    return Response(generate(), mimetype="application/x-ndjson")
 
 
 if __name__ == "__main__":